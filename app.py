@@ -6,15 +6,98 @@ This Flask application provides an elegant interface for exploring
 phosphorylation site predictions and kinase specificity across proteins.
 """
 
-from flask import Flask, render_template, jsonify, request
-from kinoplex_query import KinoPlexQuery
-from uniprot_integration import get_protein_data, get_sequence_motif
+from flask import Flask, g, render_template, jsonify, request
+from flask.json.provider import JSONProvider
+from flask_compress import Compress
+from cachetools import LRUCache
+from functools import lru_cache
+from kinoplex_query import KinoPlexQuery, KINASE_TABLES
+from uniprot_integration import get_protein_data, get_sequence_motif, uniprot_client
+import base64
+import hashlib
 import logging
 import os
+import threading
+import numpy as np
+import orjson
+
+# orjson options shared by every JSON response: allow integer dict keys and
+# serialize numpy scalars/arrays natively
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# Phosphorylatable residues, as a byte array ready for np.isin against
+# a sequence viewed as single-byte characters
+PHOSPHO_RESIDUES = np.array([b'S', b'T', b'Y'])
+
+
+class OrjsonProvider(JSONProvider):
+    """
+    Flask JSON provider backed by orjson.
+
+    orjson walks Python objects in Rust and produces UTF-8 bytes directly,
+    which is considerably faster than the stdlib encoder for our large
+    site/kinase payloads. dumps() still returns str because Flask's tojson
+    template filter expects text; response() skips that round-trip and
+    hands the bytes straight to the response object.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, option=ORJSON_OPTIONS).decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, option=ORJSON_OPTIONS),
+                                        mimetype='application/json')
+
+
+class CompressedResponseCache:
+    """
+    flask-compress cache backend that keeps compressed ETag-tagged responses.
+
+    Only responses built by cached_json_response carry an ETag derived from
+    their body, and that ETag is part of the cache key, so a cached entry can
+    never go stale - each protein is compressed once per encoding. Any other
+    response is compressed per request as usual.
+    """
+
+    def __init__(self, maxsize=256):
+        self._cache = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        if not g.get('response_etag'):
+            return None
+        with self._lock:
+            return self._cache.get(key)
+
+    def set(self, key, value):
+        if not g.get('response_etag'):
+            return
+        with self._lock:
+            self._cache[key] = value
+
+
+def compressed_cache_key(req):
+    """Cache key for compressed bodies: URL, negotiated encodings and ETag"""
+    return f"{req.path}|{req.headers.get('Accept-Encoding', '')}|{g.get('response_etag', '')}"
+
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 app.config['SECRET_KEY'] = 'your-secret-key-here'  # Change in production
 
+# Compress responses - the protein payload is highly repetitive numeric text
+# that shrinks 5-10x, which matters far more than CPU on typical links
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_MIN_SIZE'] = 1024
+app.config['COMPRESS_LEVEL'] = 4
+app.config['COMPRESS_CACHE_BACKEND'] = CompressedResponseCache
+app.config['COMPRESS_CACHE_KEY'] = compressed_cache_key
+Compress(app)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -22,10 +105,75 @@ logging.basicConfig(
 )
 
 # Initialize the database query interface
-# This connection is reused across requests for efficiency
+# Requests borrow read-only connections from a bounded pool (see KinoPlexQuery)
 db = KinoPlexQuery('kinoplex.db')
 
 
+@lru_cache(maxsize=8192)
+def get_protein_info(identifier):
+    """
+    Resolve a UniProt ID or gene symbol to its protein info.
+
+    The database is read-only while the app runs, so lookups (including
+    misses) are memoized for the lifetime of the process.
+    """
+    return db.get_protein_info(identifier)
+
+
+# Serialized /api/protein/<identifier> responses as (body, etag) pairs. The
+# underlying data only changes when the database is rebuilt, so repeat views
+# of a protein skip the query, residue mapping and serialization entirely.
+# cachetools caches aren't thread-safe, hence the lock.
+_protein_response_cache = LRUCache(maxsize=512)
+_protein_response_lock = threading.Lock()
+
+
+def cached_json_response(body, etag):
+    """Build a JSON response from pre-serialized bytes, honouring If-None-Match"""
+    response = app.response_class(body, mimetype='application/json')
+    response.set_etag(etag)
+    g.response_etag = etag
+    return response.make_conditional(request)
+
+
+def map_residues_from_sequence(sites, sequence):
+    """
+    Fill in the residues the database build couldn't resolve.
+
+    Residues stored with each site are kept as they are; only sites without
+    one are looked up in the protein sequence, as one vectorized gather
+    rather than a per-site loop. Non-phosphorylatable residues are reported
+    as S.
+
+    Returns:
+        List of single-letter residues, one per site - None for sites still
+        unresolved (no sequence, or a position beyond it)
+    """
+    residues = [site.residue for site in sites]
+    missing = [i for i, residue in enumerate(residues) if residue is None]
+    if not missing or not sequence:
+        return residues
+
+    positions = np.fromiter((sites[i].position for i in missing),
+                            dtype=np.int64, count=len(missing))
+    seq_arr = np.frombuffer(sequence.encode('ascii', 'replace'), dtype='S1')
+    in_range = (positions >= 1) & (positions <= seq_arr.size)
+    actual = seq_arr[np.where(in_range, positions - 1, 0)]
+
+    # Validate it's a phosphorylatable residue
+    phospho = np.isin(actual, PHOSPHO_RESIDUES)
+    for position, aa in zip(positions[in_range & ~phospho].tolist(),
+                            actual[in_range & ~phospho].tolist()):
+        app.logger.warning('Position %s has non-phosphorylatable residue: %s', position, aa.decode())
+
+    resolved = np.where(phospho, actual, b'S').astype('U1').tolist()
+    for i, ok, residue in zip(missing, in_range.tolist(), resolved):
+        if ok:
+            residues[i] = residue
+
+    return residues
+
+
 @app.route('/')
 def index():
     """
@@ -39,7 +187,7 @@ def index():
 
 @app.route('/protein/<identifier>')
 def protein_page(identifier):
-    protein_info = db.get_protein_info(identifier)
+    protein_info = get_protein_info(identifier)
 
     if not protein_info:
         return render_template('error.html',
@@ -51,14 +199,7 @@ def protein_page(identifier):
     # Fetch UniProt data
     uniprot_data = get_protein_data(protein_info['uniprot'])
 
-    # DEBUG: Print what we got
-    print(f"DEBUG: UniProt ID: {protein_info['uniprot']}")
-    print(f"DEBUG: uniprot_data is None: {uniprot_data is None}")
-    if uniprot_data:
-        print(f"DEBUG: Sequence length: {len(uniprot_data.get('sequence', ''))}")
-        print(f"DEBUG: Protein name: {uniprot_data.get('protein_name', 'N/A')}")
-    else:
-        print("DEBUG: uniprot_data is None or empty!")
+    app.logger.debug('UniProt %s loaded=%s', protein_info['uniprot'], uniprot_data is not None)
 
     if not uniprot_data:
         uniprot_data = {
@@ -99,7 +240,7 @@ def search_proteins():
     if len(query) < 2:
         return jsonify([])
 
-    # The database query uses indexed LIKE operations for fast matching
+    # The database query uses a trigram full-text index for fast matching
     results = db.search_proteins(query)
 
     return jsonify(results)
@@ -121,79 +262,94 @@ def api_get_protein_data(identifier):
         identifier: UniProt ID or gene symbol
 
     Returns:
-        JSON object with protein info, sites, and statistics
+        JSON object with protein info, sites, kinase names and statistics.
+        Each site's kinase scores are sent as a base64 float32 array that
+        the client expands using kinase_names[site.kinase_family].
     """
     try:
         app.logger.info(f'API request for protein: {identifier}')
 
+        with _protein_response_lock:
+            cached = _protein_response_cache.get(identifier)
+        if cached is not None:
+            return cached_json_response(*cached)
+
         data = db.get_complete_protein_data(identifier)
 
         if not data:
             app.logger.warning(f'Protein not found: {identifier}')
             return jsonify({'error': 'Protein not found'}), 404
 
-        # Get the protein sequence to determine actual S/T/Y residues
-        protein_info = db.get_protein_info(identifier)
-        uniprot_data = get_protein_data(protein_info['uniprot'])
-
-        sequence = None
-        if uniprot_data and 'sequence' in uniprot_data:
-            sequence = uniprot_data['sequence']
-            app.logger.info(f'Retrieved sequence of length {len(sequence)} for residue mapping')
-
         app.logger.info(f'Successfully loaded {len(data["sites"])} sites for {identifier}')
 
-        sites_data = []
-        for site in data['sites']:
-            # Determine the actual residue from the sequence
-            residue = 'S'  # Default fallback
-
-            if sequence and site.position <= len(sequence):
-                # Get the actual amino acid at this position (1-indexed)
-                actual_residue = sequence[site.position - 1]
-
-                # Validate it's a phosphorylatable residue
-                if actual_residue in ['S', 'T', 'Y']:
-                    residue = actual_residue
-                    app.logger.debug(f'Position {site.position}: {residue}')
-                else:
-                    app.logger.warning(f'Position {site.position} has non-phosphorylatable residue: {actual_residue}')
-            else:
-                # If no sequence available, try to infer from the site identifier
-                # or from kinase preferences (Y kinases typically have Y in their name)
-                if site.residue_type:
-                    residue = site.residue_type
-                else:
-                    # Last resort: check if this is likely a tyrosine site
-                    # based on kinase scores
-                    if site.kinase_scores:
-                        # If we have high scores for tyrosine kinases, it's likely Y
-                        tyrosine_kinases = ['ABL', 'SRC', 'FYN', 'LCK', 'SYK', 'JAK', 'EGFR', 'PDGFR']
-                        max_tk_score = max(
-                            [site.kinase_scores.get(tk, 0) for tk in tyrosine_kinases if tk in site.kinase_scores],
-                            default=0)
-                        if max_tk_score > 50:  # If any tyrosine kinase has >50% score
-                            residue = 'Y'
-
-            site_dict = {
+        sites = data['sites']
+
+        # Residues are resolved when the database is built, so normally no
+        # UniProt round-trip is needed. Databases built without residues (or
+        # sites the build couldn't resolve) fall back to the UniProt sequence.
+        residues = [site.residue for site in sites]
+        residues_complete = all(residues)
+        if not residues_complete:
+            # get_complete_protein_data already resolved the accession, so
+            # there is no need for a second identifier lookup here
+            uniprot_data = get_protein_data(data['protein']['uniprot'])
+
+            sequence = None
+            if uniprot_data and 'sequence' in uniprot_data:
+                sequence = uniprot_data['sequence']
+                app.logger.info(f'Retrieved sequence of length {len(sequence)} for residue mapping')
+
+            residues = map_residues_from_sequence(sites, sequence)
+            residues_complete = all(residues)
+
+            # Whatever is still unresolved keeps the residue type inferred
+            # from the kinase tables
+            residues = [residue or site.residue_type
+                        for site, residue in zip(sites, residues)]
+
+        # Plain dict literals are the fastest thing to hand orjson here -
+        # constructing a slotted dataclass per site costs more than the dict
+        # it would replace, and the API keys differ from PhosphoSite's fields
+        sites_data = [
+            {
                 'position': site.position,
-                'residue': residue,  # Now this is the actual residue from sequence
+                'residue': residue,  # The actual residue from sequence
                 'site_id': site.site,
-                'probability_raw': round(site.predicted_prob_raw, 4),
-                'probability_calibrated': round(site.predicted_prob_calibrated, 4),
+                'probability_raw': site.predicted_prob_raw,
+                'probability_calibrated': site.predicted_prob_calibrated,
                 'known_positive': site.known_positive,
                 'fdr_05': site.fdr_05,
                 'fdr_02': site.fdr_02,
                 'fdr_01': site.fdr_01,
-                'kinase_scores': site.kinase_scores
+                # Packed little-endian float32 scores, ordered as
+                # kinase_names[kinase_family] - passed through from the
+                # database untouched (~4x smaller than a JSON dict)
+                'kinase_family': site.kinase_family,
+                'kinase_scores_b64': (base64.b64encode(site.kinase_data).decode('ascii')
+                                      if site.kinase_data else None)
             }
-            sites_data.append(site_dict)
+            for site, residue in zip(sites, residues)
+        ]
 
-        return jsonify({
+        # Serialize directly with orjson - this is by far the largest payload
+        # we send, so skip the provider dispatch entirely
+        payload = {
             'protein': data['protein'],
             'sites': sites_data,
+            'kinase_names': {family: db.get_kinase_names(table)
+                             for family, table in KINASE_TABLES.items()},
             'statistics': data['statistics']
-        })
+        }
+        body = orjson.dumps(payload, option=ORJSON_OPTIONS)
+        etag = hashlib.blake2b(body, digest_size=8).hexdigest()
+
+        # Only cache complete responses - without a sequence the residues are
+        # a best guess, and the next request may be able to reach UniProt
+        if residues_complete:
+            with _protein_response_lock:
+                _protein_response_cache[identifier] = (body, etag)
+
+        return cached_json_response(body, etag)
 
     except Exception as e:
         app.logger.error(f'Error loading protein {identifier}: {str(e)}', exc_info=True)
@@ -243,7 +399,7 @@ def get_protein_sequence(identifier):
     """
     try:
         # Get protein info to get the UniProt ID
-        protein_info = db.get_protein_info(identifier)
+        protein_info = get_protein_info(identifier)
 
         if not protein_info:
             return jsonify({'error': 'Protein not found'}), 404
@@ -291,7 +447,7 @@ def get_site_motif(identifier, position):
     """
     try:
         # Get protein info to ensure we have the correct UniProt ID
-        protein_info = db.get_protein_info(identifier)
+        protein_info = get_protein_info(identifier)
 
         if not protein_info:
             return jsonify({'error': 'Protein not found'}), 404
@@ -306,7 +462,6 @@ def get_site_motif(identifier, position):
             return jsonify({'error': 'Could not retrieve sequence motif'}), 404
 
         # Also get the specific residue at this position for validation
-        from uniprot_integration import uniprot_client
         residue = uniprot_client.get_residue_at_position(uniprot_id, position)
 
         # Calculate where in the motif the phosphorylation site is
@@ -6,9 +6,15 @@ This script reads phospho-competency and kinase specificity data from feather fi
 and creates a well-indexed SQLite database for rapid querying in the web application.
 """
 
+import numpy as np
+import orjson
 import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.ipc as ipc
 import sqlite3
 from pathlib import Path
+import sys
 import time
 
 class KinoPlexDatabaseBuilder:
@@ -17,6 +23,9 @@ class KinoPlexDatabaseBuilder:
     for protein-based queries.
     """
     
+    # Rows decoded and rewritten at a time by migrate_kinase_data
+    MIGRATE_CHUNK_SIZE = 10000
+    
     def __init__(self, db_path='kinoplex.db'):
         """
         Initialize the database builder.
@@ -43,40 +52,55 @@ class KinoPlexDatabaseBuilder:
         1. phospho_competency: Structure-based phosphorylation predictions
         2. st_kinase_specificity: Serine/Threonine kinase PSSM percentiles
         3. y_kinase_specificity: Tyrosine kinase PSSM percentiles
+
+        plus a small kinase_index table holding the kinase name for each slot
+        of the packed kinase_data arrays.
+        
+        The site tables are WITHOUT ROWID tables clustered on their
+        (uniprot, position) primary key, so every site of a protein sits
+        together in position order in a single B-tree and no separate
+        uniprot index is needed.
         """
         cursor = self.conn.cursor()
         
+        # Larger pages mean a shallower B-tree for these short keys, and keep
+        # a full S/T kinase row (~1.2 KB) well clear of overflow pages.
+        # Must be set before the first table is created.
+        cursor.execute("PRAGMA page_size = 16384")
+        
         # Table 1: Phospho-competency data
         # This stores the core phosphorylation predictions for all STY sites
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS phospho_competency (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
                 uniprot TEXT NOT NULL,
                 gene_symbol TEXT,
                 site TEXT NOT NULL,
                 position INTEGER NOT NULL,
+                residue TEXT,
                 known_positive INTEGER,
                 predicted_prob_raw REAL,
                 predicted_prob_calibrated REAL,
                 predicted_calibrated_fdr_05 INTEGER,
                 predicted_calibrated_fdr_02 INTEGER,
-                predicted_calibrated_fdr_01 INTEGER
-            )
+                predicted_calibrated_fdr_01 INTEGER,
+                PRIMARY KEY (uniprot, position)
+            ) WITHOUT ROWID
         ''')
         
         print("✓ Created phospho_competency table")
         
         # Table 2: S/T Kinase Specificity
-        # Wide format with one column per kinase - optimized for retrieving all kinases at once
+        # kinase_data packs every kinase score for a site into one little-endian
+        # float32 array, ordered as listed in kinase_index
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS st_kinase_specificity (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
                 uniprot TEXT NOT NULL,
                 gene_symbol TEXT,
                 site TEXT NOT NULL,
                 position INTEGER NOT NULL,
-                kinase_data TEXT NOT NULL
-            )
+                kinase_data BLOB NOT NULL,
+                PRIMARY KEY (uniprot, position)
+            ) WITHOUT ROWID
         ''')
         
         print("✓ Created st_kinase_specificity table")
@@ -84,16 +108,42 @@ class KinoPlexDatabaseBuilder:
         # Table 3: Y Kinase Specificity
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS y_kinase_specificity (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
                 uniprot TEXT NOT NULL,
                 gene_symbol TEXT,
                 site TEXT NOT NULL,
                 position INTEGER NOT NULL,
-                kinase_data TEXT NOT NULL
-            )
+                kinase_data BLOB NOT NULL,
+                PRIMARY KEY (uniprot, position)
+            ) WITHOUT ROWID
         ''')
         
         print("✓ Created y_kinase_specificity table")
+
+        # Table 4: Kinase name for each slot of the kinase_data arrays
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS kinase_index (
+                table_name TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                PRIMARY KEY (table_name, idx)
+            ) WITHOUT ROWID
+        ''')
+
+        print("✓ Created kinase_index table")
+        
+        # Table 5: Full-text index of protein identifiers for autocomplete.
+        # The trigram tokenizer indexes every 3-character substring, so
+        # substring searches are index lookups over one row per protein
+        # rather than LIKE scans over every site.
+        cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS protein_search USING fts5(
+                uniprot,
+                gene_symbol,
+                tokenize = 'trigram'
+            )
+        ''')
+        
+        print("✓ Created protein_search table")
         
         self.conn.commit()
         
@@ -101,35 +151,27 @@ class KinoPlexDatabaseBuilder:
         """
         Create strategic indexes for fast querying.
         
-        Key indexes:
-        - UniProt ID: Primary query field for users
-        - Gene Symbol: Alternative query field
-        - Composite indexes on (uniprot, position): For ordered retrieval of sites
+        Lookups by UniProt ID, and ordered retrieval of a protein's sites,
+        are served by each table's (uniprot, position) primary key. The only
+        secondary indexes needed are on gene symbol - the alternative query
+        field. In a WITHOUT ROWID table these carry the primary key columns,
+        so a gene lookup resolves straight to (uniprot, position).
         """
         cursor = self.conn.cursor()
         
         print("\nCreating indexes for optimal query performance...")
         
-        # Indexes for phospho_competency table
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_phospho_uniprot 
-            ON phospho_competency(uniprot)
-        ''')
-        
         cursor.execute('''
             CREATE INDEX IF NOT EXISTS idx_phospho_gene 
             ON phospho_competency(gene_symbol)
         ''')
         
+        # Partial index of just the known sites, so counting them reads
+        # ~10% of the rows instead of scanning the whole table
         cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_phospho_uniprot_position 
-            ON phospho_competency(uniprot, position)
-        ''')
-        
-        # Indexes for ST kinase specificity
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_st_uniprot 
-            ON st_kinase_specificity(uniprot)
+            CREATE INDEX IF NOT EXISTS idx_phospho_known 
+            ON phospho_competency(known_positive) 
+            WHERE known_positive = 1
         ''')
         
         cursor.execute('''
@@ -137,42 +179,85 @@ class KinoPlexDatabaseBuilder:
             ON st_kinase_specificity(gene_symbol)
         ''')
         
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_st_uniprot_position 
-            ON st_kinase_specificity(uniprot, position)
-        ''')
-        
-        # Indexes for Y kinase specificity
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_y_uniprot 
-            ON y_kinase_specificity(uniprot)
-        ''')
-        
         cursor.execute('''
             CREATE INDEX IF NOT EXISTS idx_y_gene 
             ON y_kinase_specificity(gene_symbol)
         ''')
         
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_y_uniprot_position 
-            ON y_kinase_specificity(uniprot, position)
-        ''')
-        
         self.conn.commit()
         print("✓ All indexes created successfully")
         
-    def load_phospho_competency(self, feather_path):
+    def load_sequences(self, fasta_path):
+        """
+        Read protein sequences from a UniProt FASTA file.
+        
+        Args:
+            fasta_path: Path to a FASTA file such as the UniProt human proteome
+        
+        Returns:
+            Dictionary mapping UniProt accession to amino acid sequence
+        """
+        print(f"\nLoading protein sequences from {fasta_path}...")
+        
+        sequences = {}
+        accession = None
+        chunks = []
+        with open(fasta_path) as handle:
+            for line in handle:
+                line = line.strip()
+                if line.startswith('>'):
+                    if accession:
+                        sequences[accession] = ''.join(chunks)
+                    # UniProt headers look like ">sp|P04637|P53_HUMAN ..."
+                    header = line[1:].split()[0]
+                    parts = header.split('|')
+                    accession = parts[1] if len(parts) > 2 else header
+                    chunks = []
+                elif line:
+                    chunks.append(line)
+            if accession:
+                sequences[accession] = ''.join(chunks)
+        
+        print(f"✓ Loaded {len(sequences):,} sequences")
+        return sequences
+        
+    def load_phospho_competency(self, feather_path, sequences=None):
         """
         Load phospho-competency data from feather file into database.
         
+        The residue (S/T/Y) of every site is resolved here, once, so the web
+        app never needs a UniProt round-trip to label sites. It is taken from
+        the protein sequence when available, otherwise from the site
+        identifier when that encodes it (e.g. "S78"); sites that can't be
+        resolved are stored with a NULL residue.
+        
         Args:
             feather_path: Path to the Total_Phosphocompetency_STY.feather file
+            sequences: Optional mapping of UniProt accession to sequence
         """
         print(f"\nLoading phospho-competency data from {feather_path}...")
         start_time = time.time()
         
-        # Read the feather file
-        df = pd.read_feather(feather_path)
+        # Columns to keep, renamed to match our schema
+        column_mapping = {
+            'uniprot': 'uniprot',
+            'genesymbol': 'gene_symbol',
+            'site': 'site',
+            'position': 'position',
+            'knownpositive': 'known_positive',
+            'predictedprob_raw': 'predicted_prob_raw',
+            'predictedprob_calibrated': 'predicted_prob_calibrated',
+            'predicted_calibrated_fdr_05': 'predicted_calibrated_fdr_05',
+            'predicted_calibrated_fdr_02': 'predicted_calibrated_fdr_02',
+            'predicted_calibrated_fdr_01': 'predicted_calibrated_fdr_01'
+        }
+        
+        # Read only the columns we keep, straight into Arrow - the rest of
+        # the file is never decoded
+        with pa.memory_map(feather_path) as source:
+            names = ipc.open_file(source).schema.names
+        wanted = [name for name in names if name.lower().replace(' ', '_') in column_mapping]
+        df = feather.read_table(feather_path, columns=wanted).to_pandas(self_destruct=True)
         
         # Clean column names to match our schema
         df.columns = [col.lower().replace(' ', '_') for col in df.columns]
@@ -189,35 +274,70 @@ class KinoPlexDatabaseBuilder:
         if 'position' in df.columns:
             df['position'] = df['position'].astype('int64').astype(int)
         
-        # Select and rename columns to match our schema
-        column_mapping = {
-            'uniprot': 'uniprot',
-            'genesymbol': 'gene_symbol',
-            'site': 'site',
-            'position': 'position',
-            'knownpositive': 'known_positive',
-            'predictedprob_raw': 'predicted_prob_raw',
-            'predictedprob_calibrated': 'predicted_prob_calibrated',
-            'predicted_calibrated_fdr_05': 'predicted_calibrated_fdr_05',
-            'predicted_calibrated_fdr_02': 'predicted_calibrated_fdr_02',
-            'predicted_calibrated_fdr_01': 'predicted_calibrated_fdr_01'
-        }
-        
+        # Rename columns to match our schema
         df_clean = df.rename(columns=column_mapping)
         df_clean = df_clean[[col for col in column_mapping.values() if col in df_clean.columns]]
         
-        # Insert into database
-        df_clean.to_sql('phospho_competency', self.conn, if_exists='append', index=False)
+        # (uniprot, position) is the primary key - keep the last row of any
+        # duplicated site, as a re-listed site supersedes the earlier entry
+        duplicates = df_clean.duplicated(['uniprot', 'position'], keep='last')
+        if duplicates.any():
+            print(f"  Dropping {duplicates.sum():,} duplicate sites (keeping the last row of each)")
+            df_clean = df_clean[~duplicates]
+        
+        # Resolve residues - site identifiers only sometimes carry the residue
+        # letter, so prefer the actual sequence when one was provided
+        residue = df_clean['site'].astype(str).str.extract(r'([STY])\d+$', expand=False)
+        if sequences:
+            from_sequence = []
+            for uniprot, pos in zip(df_clean['uniprot'].tolist(), df_clean['position'].tolist()):
+                # Isoform and non-proteome accessions are often missing
+                # from the FASTA; those fall back to the site identifier
+                seq = sequences.get(uniprot)
+                from_sequence.append(seq[pos - 1] if seq and 0 < pos <= len(seq) else None)
+            residue = pd.Series(from_sequence, index=df_clean.index).fillna(residue)
+        df_clean['residue'] = residue.where(residue.isin(['S', 'T', 'Y']))
+        
+        resolved = df_clean['residue'].notna().sum()
+        print(f"  Resolved residues for {resolved:,}/{len(df_clean):,} sites")
+        
+        # Insert with plain executemany - pandas to_sql commits on its own,
+        # which would split build_database's single load transaction
+        df_clean['residue'] = df_clean['residue'].astype(object).where(df_clean['residue'].notna(), None)
+        columns = df_clean.columns.tolist()
+        self.conn.executemany(
+            f'INSERT INTO phospho_competency ({", ".join(columns)}) '
+            f'VALUES ({", ".join("?" * len(columns))})',
+            zip(*(df_clean[col].tolist() for col in columns))
+        )
         
         elapsed = time.time() - start_time
         print(f"✓ Loaded {len(df_clean):,} phosphorylation sites in {elapsed:.2f} seconds")
         
+    def build_search_index(self):
+        """
+        Populate the protein_search full-text index with one row per protein.
+        
+        Must run after load_phospho_competency.
+        """
+        self.conn.execute('DELETE FROM protein_search')
+        self.conn.execute('''
+            INSERT INTO protein_search (uniprot, gene_symbol)
+            SELECT DISTINCT uniprot, gene_symbol
+            FROM phospho_competency
+        ''')
+        
+        count = self.conn.execute('SELECT COUNT(*) FROM protein_search').fetchone()[0]
+        print(f"✓ Indexed {count:,} proteins for search")
+        
     def load_kinase_specificity(self, feather_path, table_name):
         """
         Load kinase specificity data from feather file into database.
         
-        Instead of creating hundreds of columns, we store kinase scores as JSON
-        for flexible retrieval and visualization.
+        Instead of creating hundreds of columns, we store each site's kinase
+        scores as a packed float32 array (little-endian) and record the kinase
+        order once in the kinase_index table. Reading a site back is then a
+        single buffer cast rather than a JSON parse.
         
         Args:
             feather_path: Path to the PSSM percentile feather file
@@ -226,40 +346,61 @@ class KinoPlexDatabaseBuilder:
         print(f"\nLoading kinase specificity data from {feather_path}...")
         start_time = time.time()
         
-        # Read the feather file
-        df = pd.read_feather(feather_path)
+        # Read the feather file as Arrow - with hundreds of kinase columns,
+        # building a pandas frame only to convert it back to numpy is the
+        # slowest part of the load
+        table = feather.read_table(feather_path)
         
         # First 4 columns are metadata, rest are kinase scores
-        metadata_cols = df.columns[:4].tolist()
-        kinase_cols = df.columns[4:].tolist()
+        metadata_cols = table.column_names[:4]
+        kinase_cols = table.column_names[4:]
         
         print(f"  Found {len(kinase_cols)} kinases in dataset")
         
-        # Convert kinase columns to JSON format for storage
-        # This allows flexible retrieval and keeps the database normalized
-        import json
-        
-        def row_to_kinase_json(row):
-            """Convert kinase percentile scores to JSON string"""
-            kinase_dict = {kinase: float(row[kinase]) for kinase in kinase_cols}
-            return json.dumps(kinase_dict)
-        
-        # Create a clean dataframe for insertion
-        df_insert = pd.DataFrame({
-            'uniprot': df[df.columns[0]],
-            'gene_symbol': df[df.columns[1]],
-            'site': df[df.columns[2]],
-            'position': df[df.columns[3]].astype('int64').astype(int),  # Ensure proper Python int
-            'kinase_data': df.apply(row_to_kinase_json, axis=1)
-        })
-        
-        # Insert into database
-        df_insert.to_sql(table_name, self.conn, if_exists='append', index=False)
+        # Pack the kinase columns into one fixed-width float32 row per site,
+        # copying one column at a time straight out of Arrow
+        scores = np.empty((table.num_rows, len(kinase_cols)), dtype='<f4')
+        for idx, name in enumerate(kinase_cols):
+            scores[:, idx] = table.column(name).to_numpy()
+        
+        # Slice every blob out of one contiguous buffer rather than calling
+        # tobytes() per row
+        packed = scores.tobytes()
+        width = scores.shape[1] * scores.itemsize
+        
+        # Build plain Python rows for executemany - this skips the pandas
+        # to_sql type inference and its commits entirely
+        rows = list(zip(
+            table.column(metadata_cols[0]).to_pylist(),
+            table.column(metadata_cols[1]).to_pylist(),
+            table.column(metadata_cols[2]).to_pylist(),
+            table.column(metadata_cols[3]).to_numpy().astype('int64').tolist(),  # Ensure proper Python int
+            [packed[start:start + width] for start in range(0, len(packed), width)]
+        ))
+        
+        # (uniprot, position) is the primary key - INSERT OR REPLACE below
+        # keeps the last row of any duplicated site, as for phospho_competency
+        duplicates = len(rows) - len({(row[0], row[3]) for row in rows})
+        if duplicates:
+            print(f"  Dropping {duplicates:,} duplicate sites (keeping the last row of each)")
+        
+        # Record the kinase order once - every packed array follows it
+        self.conn.execute('DELETE FROM kinase_index WHERE table_name = ?', (table_name,))
+        self.conn.executemany(
+            'INSERT INTO kinase_index (table_name, idx, name) VALUES (?, ?, ?)',
+            [(table_name, idx, name) for idx, name in enumerate(kinase_cols)]
+        )
+        
+        self.conn.executemany(
+            f'INSERT OR REPLACE INTO {table_name} (uniprot, gene_symbol, site, position, kinase_data) '
+            'VALUES (?, ?, ?, ?, ?)',
+            rows
+        )
         
         elapsed = time.time() - start_time
-        print(f"✓ Loaded {len(df_insert):,} sites with kinase specificity in {elapsed:.2f} seconds")
+        print(f"✓ Loaded {len(rows) - duplicates:,} sites with kinase specificity in {elapsed:.2f} seconds")
         
-    def build_database(self, phospho_path, st_pssm_path, y_pssm_path):
+    def build_database(self, phospho_path, st_pssm_path, y_pssm_path, fasta_path=None):
         """
         Complete database build process.
         
@@ -267,6 +408,7 @@ class KinoPlexDatabaseBuilder:
             phospho_path: Path to phospho-competency feather file
             st_pssm_path: Path to S/T PSSM percentiles feather file
             y_pssm_path: Path to Y PSSM percentiles feather file
+            fasta_path: Optional UniProt FASTA used to resolve site residues
         """
         print("=" * 70)
         print("KinoPlex Database Builder")
@@ -276,13 +418,25 @@ class KinoPlexDatabaseBuilder:
             # Connect to database
             self.connect()
             
+            # The database is rebuilt from scratch if a build fails, so keep
+            # the rollback journal in RAM and skip fsyncs during the bulk load
+            self.conn.execute("PRAGMA journal_mode = MEMORY")
+            self.conn.execute("PRAGMA synchronous = OFF")
+            self.conn.execute("PRAGMA temp_store = MEMORY")
+            self.conn.execute("PRAGMA cache_size = -524288")  # 512 MB
+            
             # Create schema
             print("\n[1/5] Creating database schema...")
             self.create_tables()
             
+            # Load all three datasets in one transaction with a single commit
+            self.conn.execute("BEGIN EXCLUSIVE")
+            
             # Load phospho-competency data
             print("\n[2/5] Loading phosphorylation competency data...")
-            self.load_phospho_competency(phospho_path)
+            sequences = self.load_sequences(fasta_path) if fasta_path else None
+            self.load_phospho_competency(phospho_path, sequences)
+            self.build_search_index()
             
             # Load S/T kinase specificity
             print("\n[3/5] Loading S/T kinase specificity data...")
@@ -292,7 +446,10 @@ class KinoPlexDatabaseBuilder:
             print("\n[4/5] Loading Y kinase specificity data...")
             self.load_kinase_specificity(y_pssm_path, 'y_kinase_specificity')
             
-            # Create indexes
+            self.conn.commit()
+            
+            # Create indexes once the data is in - much faster than
+            # maintaining them during the inserts
             print("\n[5/5] Creating indexes for fast querying...")
             self.create_indexes()
             
@@ -301,6 +458,10 @@ class KinoPlexDatabaseBuilder:
             self.conn.execute("VACUUM")
             self.conn.execute("ANALYZE")
             
+            # Leave the file in the mode the web app reads it in
+            self.conn.execute("PRAGMA journal_mode = WAL")
+            self.conn.execute("PRAGMA synchronous = NORMAL")
+            
             print("\n" + "=" * 70)
             print("✓ Database build complete!")
             print(f"✓ Database saved to: {self.db_path}")
@@ -315,6 +476,98 @@ class KinoPlexDatabaseBuilder:
         finally:
             self.close()
             
+    def migrate_kinase_data(self):
+        """
+        Convert a database built with JSON kinase_data in place.
+        
+        Older builds stored each site's kinase scores as a JSON object of
+        kinase -> score text. This rewrites every such row as a packed
+        float32 blob, records the kinase order in kinase_index, and adds the
+        protein_search index, so the web app can serve the database without
+        a full rebuild from the feather files.
+        """
+        print("=" * 70)
+        print("KinoPlex Database Migration")
+        print("=" * 70)
+        
+        try:
+            self.connect()
+            
+            # Adds kinase_index and protein_search; existing tables are kept
+            self.create_tables()
+            
+            self.conn.execute("BEGIN EXCLUSIVE")
+            
+            for table_name in ('st_kinase_specificity', 'y_kinase_specificity'):
+                start_time = time.time()
+                select = (
+                    f"SELECT rowid, kinase_data FROM {table_name} "
+                    "WHERE rowid > ? AND typeof(kinase_data) = 'text' "
+                    "ORDER BY rowid LIMIT ?"
+                )
+                
+                # Walk the table in rowid-ordered chunks so only one chunk of
+                # JSON text and scores is ever held in memory
+                kinase_cols = None
+                last_rowid = 0
+                migrated = 0
+                while True:
+                    rows = self.conn.execute(select, (last_rowid, self.MIGRATE_CHUNK_SIZE)).fetchall()
+                    if not rows:
+                        break
+                    
+                    if kinase_cols is None:
+                        # Every row was written from the same feather columns,
+                        # so the first row's key order is the kinase order
+                        kinase_cols = list(orjson.loads(rows[0][1]))
+                        self.conn.execute('DELETE FROM kinase_index WHERE table_name = ?', (table_name,))
+                        self.conn.executemany(
+                            'INSERT INTO kinase_index (table_name, idx, name) VALUES (?, ?, ?)',
+                            [(table_name, idx, name) for idx, name in enumerate(kinase_cols)]
+                        )
+                    
+                    scores = np.empty((len(rows), len(kinase_cols)), dtype='<f4')
+                    for i, (_, data) in enumerate(rows):
+                        entry = orjson.loads(data)
+                        scores[i] = [entry.get(name, np.nan) for name in kinase_cols]
+                    
+                    packed = scores.tobytes()
+                    width = scores.shape[1] * scores.itemsize
+                    self.conn.executemany(
+                        f'UPDATE {table_name} SET kinase_data = ? WHERE rowid = ?',
+                        [(packed[i * width:(i + 1) * width], rowid)
+                         for i, (rowid, _) in enumerate(rows)]
+                    )
+                    
+                    last_rowid = rows[-1][0]
+                    migrated += len(rows)
+                
+                if not migrated:
+                    print(f"✓ {table_name} is already packed")
+                    continue
+                
+                elapsed = time.time() - start_time
+                print(f"✓ Packed {migrated:,} rows of {table_name} in {elapsed:.2f} seconds")
+            
+            self.build_search_index()
+            self.conn.commit()
+            
+            # Packed rows are a fraction of the JSON size - reclaim the space
+            print("\nOptimizing database...")
+            self.conn.execute("VACUUM")
+            self.conn.execute("ANALYZE")
+            self.conn.execute("PRAGMA journal_mode = WAL")
+            
+            print("\n" + "=" * 70)
+            print("✓ Database migration complete!")
+            print("=" * 70)
+            
+        except Exception as e:
+            print(f"\n✗ Error migrating database: {e}")
+            raise
+        finally:
+            self.close()
+            
     def print_statistics(self):
         """Print helpful statistics about the database"""
         cursor = self.conn.cursor()
@@ -353,10 +606,27 @@ def main():
     phospho_path = '/Users/davidvanderwall/Desktop/Total_Phosphocompetency_STY.feather'
     st_pssm_path = '/Users/davidvanderwall/Desktop/ST_PSSM_Percentiles.feather'
     y_pssm_path = '/Users/davidvanderwall/Desktop/Y_PSSM_Percentiles.feather'
+    # UniProt human proteome FASTA, used to store each site's residue (optional)
+    fasta_path = '/Users/davidvanderwall/Desktop/UP000005640_9606.fasta'
     
-    # Create database
     builder = KinoPlexDatabaseBuilder(db_path='kinoplex.db')
-    builder.build_database(phospho_path, st_pssm_path, y_pssm_path)
+    
+    # An existing database with JSON kinase_data can be converted in place
+    # with: python db_build.py --migrate
+    if '--migrate' in sys.argv[1:]:
+        builder.migrate_kinase_data()
+        return
+    
+    if not Path(fasta_path).exists():
+        # Site identifiers rarely carry the residue letter, so without the
+        # FASTA most residues stay NULL and the web app fetches every
+        # protein's sequence from UniProt to label its sites
+        print(f"⚠ FASTA not found at {fasta_path} - site residues will mostly be "
+              "unresolved and the web app will fall back to UniProt for them")
+        fasta_path = None
+    
+    # Create database
+    builder.build_database(phospho_path, st_pssm_path, y_pssm_path, fasta_path=fasta_path)
     
 
 if __name__ == '__main__':
@@ -6,28 +6,123 @@ The issue: site IDs are like "P04637_6" not "S6", so we need to
 determine residue type differently.
 """
 
+import logging
+import queue
 import sqlite3
-import json
+import threading
 import time
-from typing import Dict, List, Optional
+import numpy as np
+from cachetools import LRUCache
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# kinase_data blobs are packed little-endian float32 arrays (see db_build.py)
+KINASE_SCORE_DTYPE = np.dtype('<f4')
+
+# Decimal places kinase scores are reported to. Percentiles run 0-100, where
+# float32 resolves about 5 decimals; rounding the widened doubles keeps
+# float32 noise (99.2 -> 99.20000457763672) out of the API output.
+KINASE_SCORE_DECIMALS = 4
+
+# Shared kinase_scores of every site without kinase data - read-only, so a
+# single instance saves an empty dict per site
+_NO_KINASE_SCORES = {}
+
+# Kinase families and the specificity table holding their packed scores
+KINASE_TABLES = {
+    'ST': 'st_kinase_specificity',
+    'Y': 'y_kinase_specificity',
+}
+
+
+def decode_kinase_scores(blob: bytes, names: List[str]) -> Dict[str, float]:
+    """Unpack a kinase_data blob into a kinase -> score dict"""
+    scores = np.frombuffer(blob, dtype=KINASE_SCORE_DTYPE)
+    return dict(zip(names, round_kinase_scores(scores)))
+
+
+def round_kinase_scores(scores: np.ndarray) -> List[float]:
+    """Widen float32 scores to Python floats at KINASE_SCORE_DECIMALS precision"""
+    return np.round(scores.astype(np.float64), KINASE_SCORE_DECIMALS).tolist()
+
+
+def build_kinase_map(rows, names: List[str], label: str) -> Dict[int, bytes]:
+    """
+    Map position -> packed kinase_data blob from (position, kinase_data) rows.
+
+    Blobs are only size-checked here, in one pass over all lengths;
+    PhosphoSite unpacks them on demand. Rows whose blob doesn't match the
+    table's kinase index are reported and skipped.
+    """
+    kinase_map = dict(rows)
+
+    expected = len(names) * KINASE_SCORE_DTYPE.itemsize
+    lengths = np.fromiter(map(len, kinase_map.values()), dtype=np.int64, count=len(kinase_map))
+    if (lengths != expected).any():
+        for position, blob in list(kinase_map.items()):
+            if len(blob) != expected:
+                logger.warning("Error parsing %s kinase data at position %s: "
+                               "expected %d scores, got %d bytes",
+                               label, position, len(names), len(blob))
+                del kinase_map[position]
+
+    return kinase_map
+
 
 class PhosphoSite:
-    """Simple class for phosphorylation site"""
+    """
+    Simple class for phosphorylation site
+
+    Kinase scores can be given either as a ready dict or as the raw packed
+    kinase_data blob plus its kinase names; the blob is only unpacked into a
+    dict the first time kinase_scores is read, so callers that just pass the
+    blob along (e.g. the protein API) never pay for decoding.
+    """
+
+    # One instance per site, thousands per protein - slots drop the
+    # per-instance __dict__
+    __slots__ = (
+        'position', 'site', 'uniprot', 'gene_symbol', 'residue_type', 'residue',
+        'predicted_prob_raw', 'predicted_prob_calibrated', 'known_positive',
+        'fdr_05', 'fdr_02', 'fdr_01', 'kinase_family', 'kinase_data',
+        'kinase_names', '_kinase_scores',
+    )
+
     def __init__(self, position, site, uniprot, gene_symbol, residue_type,
                  predicted_prob_raw, predicted_prob_calibrated, known_positive,
-                 fdr_05, fdr_02, fdr_01, kinase_scores):
+                 fdr_05, fdr_02, fdr_01, kinase_scores=None,
+                 kinase_family=None, kinase_data=None, kinase_names=None,
+                 residue=None):
         self.position = position
         self.site = site
         self.uniprot = uniprot
         self.gene_symbol = gene_symbol
         self.residue_type = residue_type
+        # Actual S/T/Y residue resolved at build time (None if unknown)
+        self.residue = residue
         self.predicted_prob_raw = predicted_prob_raw
         self.predicted_prob_calibrated = predicted_prob_calibrated
         self.known_positive = known_positive
         self.fdr_05 = fdr_05
         self.fdr_02 = fdr_02
         self.fdr_01 = fdr_01
-        self.kinase_scores = kinase_scores if kinase_scores is not None else {}
+        self.kinase_family = kinase_family
+        self.kinase_data = kinase_data
+        self.kinase_names = kinase_names
+        self._kinase_scores = kinase_scores
+
+    @property
+    def kinase_scores(self) -> Dict[str, float]:
+        """Kinase -> score dict, unpacked from kinase_data on first access"""
+        if self._kinase_scores is None:
+            if self.kinase_data is None:
+                self._kinase_scores = _NO_KINASE_SCORES
+            else:
+                self._kinase_scores = decode_kinase_scores(self.kinase_data, self.kinase_names)
+        return self._kinase_scores
 
 
 class KinoPlexQuery:
@@ -35,34 +130,235 @@ class KinoPlexQuery:
     FIXED: Correctly loads kinase scores by properly determining residue type
     """
 
+    # SQL used on the request path. Kept as constants so every call passes
+    # the identical string and hits the connection's prepared statement
+    # cache instead of re-compiling the query.
+    # Identifier resolution: a UniProt ID is a single primary key probe and
+    # only falls back to the gene symbol index when it doesn't match
+    _SQL_PROTEIN_BY_UNIPROT = """
+        SELECT uniprot, gene_symbol
+        FROM phospho_competency
+        WHERE uniprot = ?
+        LIMIT 1
+    """
+
+    _SQL_PROTEIN_BY_GENE = """
+        SELECT uniprot, gene_symbol
+        FROM phospho_competency
+        WHERE gene_symbol = ?
+        LIMIT 1
+    """
+
+    # Every site and kinase row of one protein in a single statement, tagged
+    # by source table. {residue} is filled in once per database (see
+    # __init__) since older builds have no residue column.
+    _SQL_PROTEIN_SITES = """
+        SELECT 'P' AS src, position, site, NULL AS kinase_data,
+               {residue} AS residue,
+               predicted_prob_raw, predicted_prob_calibrated, known_positive,
+               predicted_calibrated_fdr_05, predicted_calibrated_fdr_02,
+               predicted_calibrated_fdr_01
+        FROM phospho_competency
+        WHERE uniprot = ?
+        UNION ALL
+        SELECT 'ST', position, site, kinase_data,
+               NULL, NULL, NULL, NULL, NULL, NULL, NULL
+        FROM st_kinase_specificity
+        WHERE uniprot = ?
+        UNION ALL
+        SELECT 'Y', position, site, kinase_data,
+               NULL, NULL, NULL, NULL, NULL, NULL, NULL
+        FROM y_kinase_specificity
+        WHERE uniprot = ?
+        ORDER BY position
+    """
+
+    _SQL_KINASE_NAMES = "SELECT name FROM kinase_index WHERE table_name = ? ORDER BY idx"
+
+    _SQL_SEARCH = """
+        SELECT uniprot, gene_symbol
+        FROM protein_search
+        WHERE protein_search MATCH ?
+        ORDER BY rank
+        LIMIT ?
+    """
+
+    _SQL_SEARCH_SHORT = """
+        SELECT uniprot, gene_symbol
+        FROM protein_search
+        WHERE uniprot LIKE ? OR gene_symbol LIKE ?
+        ORDER BY gene_symbol
+        LIMIT ?
+    """
+
+    # One kinase's score at every site of a protein. substr() slices just that
+    # kinase's 4 bytes out of each packed array, so no other score is read.
+    # {table} is the specificity table holding the kinase.
+    _SQL_KINASE_PROFILE = """
+        SELECT k.position, p.site, substr(k.kinase_data, ?, 4),
+               p.predicted_calibrated_fdr_05
+        FROM {table} k
+        JOIN phospho_competency p
+          ON p.uniprot = k.uniprot AND p.position = k.position
+        WHERE k.uniprot = ? AND length(k.kinase_data) = ?
+        ORDER BY k.position
+    """
+
+    _SQL_STATS_PROTEINS = "SELECT COUNT(DISTINCT uniprot) FROM phospho_competency"
+    _SQL_STATS_SITES = "SELECT COUNT(*) FROM phospho_competency"
+    _SQL_STATS_KNOWN = "SELECT COUNT(*) FROM phospho_competency WHERE known_positive = 1"
+
+    # Number of assembled proteins kept by get_complete_protein_data
+    PROTEIN_CACHE_SIZE = 128
+
+    # Most read-only connections open at once (see _borrow)
+    POOL_SIZE = 16
+
     def __init__(self, db_path: str = 'kinoplex.db'):
         """Initialize database connection"""
         self.db_path = db_path
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
-        self.conn.row_factory = sqlite3.Row
 
-        # Enable optimizations
-        self.conn.execute("PRAGMA optimize")
-        self.conn.execute("PRAGMA cache_size = 10000")
+        # Queries borrow a read-only connection from a pool (see _borrow), so
+        # WAL readers run in parallel instead of queueing on one shared
+        # connection. Unlike one connection per thread, the pool stays
+        # bounded when the server starts a thread per request.
+        self._pool = queue.LifoQueue()
+        self._pool_slots = threading.BoundedSemaphore(self.POOL_SIZE)
+        # Guards returning connections to the pool against close()
+        self._pool_lock = threading.Lock()
+        self._closed = False
+
+        # journal_mode is persistent in the database file, so switching to WAL
+        # once here covers every reader connection opened later
+        conn = sqlite3.connect(db_path)
+        conn.execute("PRAGMA optimize")
+        conn.execute("PRAGMA journal_mode = WAL")
+        # Fold anything optimize wrote back into the main file. Readers
+        # serve pages of the main file straight from the mmap, but pages
+        # still in the WAL go through a lookup and a read() each time.
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(phospho_competency)")}
+        conn.close()
+
+        # Databases built before residues were stored lack the column
+        self._sql_protein_sites = self._SQL_PROTEIN_SITES.format(
+            residue='residue' if 'residue' in columns else 'NULL'
+        )
+
+        # Kinase names per specificity table, in kinase_data array order
+        self._kinase_names = {}
+        # Kinase name -> [(family, slot in that table's kinase_data arrays)]
+        self._kinase_slots = None
+        # Whole-database counts (see get_database_statistics)
+        self._database_stats = None
+
+        # Assembled proteins, keyed by identifier. The database is read-only
+        # while serving, so entries never need invalidating.
+        self._protein_cache = LRUCache(maxsize=self.PROTEIN_CACHE_SIZE)
+        self._protein_cache_lock = threading.Lock()
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open a read-only connection tuned for serving"""
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+        # Rows come back as plain tuples and are unpacked positionally -
+        # sqlite3.Row's per-field name lookup shows up on large proteins
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False,
+                               cached_statements=256)
+
+        # Read-only serving workload: a large page cache + mmap keeps hot
+        # pages in memory and temp b-trees never touch disk
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA cache_size = -131072")  # 128 MB
+        conn.execute("PRAGMA mmap_size = 1073741824")  # 1 GB
+        conn.execute("PRAGMA query_only = 1")
+        return conn
+
+    @contextmanager
+    def _borrow(self):
+        """
+        Borrow a pooled connection for the duration of a with block.
 
-    def get_protein_info(self, identifier: str) -> Optional[Dict]:
-        """Get basic protein information"""
-        cursor = self.conn.cursor()
+        At most POOL_SIZE connections exist; further callers wait for one to
+        be returned. The most recently returned connection is handed out
+        first, so hot connections keep warm page and statement caches.
+        Once the pool is closed, connections are closed on return instead.
+        """
+        with self._pool_slots:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                conn = self._open_connection()
+            try:
+                yield conn
+            finally:
+                with self._pool_lock:
+                    if not self._closed:
+                        self._pool.put(conn)
+                        conn = None
+                if conn is not None:
+                    conn.close()
+
+    def close(self):
+        """
+        Close the connection pool.
 
-        query = """
-            SELECT DISTINCT uniprot, gene_symbol
-            FROM phospho_competency
-            WHERE uniprot = ? OR gene_symbol = ?
-            LIMIT 1
+        Idle connections are closed now; connections still on loan are
+        closed as their borrowers return them.
         """
+        with self._pool_lock:
+            self._closed = True
+            idle = []
+            while True:
+                try:
+                    idle.append(self._pool.get_nowait())
+                except queue.Empty:
+                    break
+        for conn in idle:
+            conn.close()
+
+    def get_kinase_names(self, table_name: str) -> List[str]:
+        """Get the kinase order used by the packed kinase_data arrays of a table"""
+        names = self._kinase_names.get(table_name)
+        if names is None:
+            rows = self._fetchall(self._SQL_KINASE_NAMES, (table_name,))
+            names = [name for (name,) in rows]
+            self._kinase_names[table_name] = names
+        return names
+
+    def get_kinase_slots(self, kinase_name: str) -> List[Tuple[str, int]]:
+        """
+        Get the (family, kinase_data array index) of a kinase in every
+        specificity table that scores it - S/T first, then Y.
+        """
+        if self._kinase_slots is None:
+            slots = {}
+            for family, table_name in KINASE_TABLES.items():
+                for idx, name in enumerate(self.get_kinase_names(table_name)):
+                    slots.setdefault(name, []).append((family, idx))
+            self._kinase_slots = slots
+        return self._kinase_slots.get(kinase_name, [])
+
+    def _fetchall(self, query: str, params=()) -> List[tuple]:
+        """Run a read query on a pooled connection and return all rows"""
+        with self._borrow() as conn:
+            return conn.execute(query, params).fetchall()
+
+    def _fetchone(self, query: str, params=()) -> Optional[tuple]:
+        """Run a read query on a pooled connection and return the first row"""
+        with self._borrow() as conn:
+            return conn.execute(query, params).fetchone()
 
-        cursor.execute(query, (identifier, identifier))
-        row = cursor.fetchone()
+    def get_protein_info(self, identifier: str) -> Optional[Dict]:
+        """Get basic protein information"""
+        row = self._fetchone(self._SQL_PROTEIN_BY_UNIPROT, (identifier,))
+        if row is None:
+            row = self._fetchone(self._SQL_PROTEIN_BY_GENE, (identifier,))
 
         if row:
+            uniprot, gene_symbol = row
             return {
-                'uniprot': row['uniprot'],
-                'gene_symbol': row['gene_symbol']
+                'uniprot': uniprot,
+                'gene_symbol': gene_symbol
             }
         return None
 
@@ -70,106 +366,99 @@ class KinoPlexQuery:
         """
         Get complete protein data with PROPERLY LOADED kinase scores
 
+        Results are cached per identifier, so drilling into the same protein
+        (kinase profiles, page reloads) doesn't rebuild every site. The
+        returned data is shared between callers and must not be modified.
+        """
+        with self._protein_cache_lock:
+            data = self._protein_cache.get(identifier)
+        if data is not None:
+            return data
+
+        data = self._load_complete_protein_data(identifier)
+        if data is not None:
+            with self._protein_cache_lock:
+                self._protein_cache[identifier] = data
+        return data
+
+    def _load_complete_protein_data(self, identifier: str) -> Optional[Dict]:
+        """
+        Build complete protein data from the database (uncached)
+
         FIXED: Correctly determines residue type by checking which table has data
         """
 
         start_time = time.time()
-        cursor = self.conn.cursor()
-
-        # Query 1: Get phospho-competency data
-        phospho_query = """
-            SELECT *
-            FROM phospho_competency
-            WHERE uniprot = ? OR gene_symbol = ?
-            ORDER BY position
-        """
 
-        cursor.execute(phospho_query, (identifier, identifier))
-        phospho_rows = cursor.fetchall()
+        # Resolve the identifier once, then fetch the protein's sites and
+        # both kinase tables in one round-trip
+        protein_info = self.get_protein_info(identifier)
+        if not protein_info:
+            return None
+        uniprot = protein_info['uniprot']
+
+        rows = self._fetchall(self._sql_protein_sites, (uniprot, uniprot, uniprot))
+
+        # Partition by source table in a single pass - ORDER BY keeps the
+        # phospho rows in position order. Kinase rows are cut down to
+        # (position, kinase_data) pairs.
+        phospho_rows = []
+        st_rows = []
+        y_rows = []
+        for row in rows:
+            src = row[0]
+            if src == 'P':
+                phospho_rows.append(row)
+            elif src == 'ST':
+                st_rows.append((row[1], row[3]))
+            else:
+                y_rows.append((row[1], row[3]))
 
         if not phospho_rows:
             return None
 
-        # Extract protein info
-        protein_info = {
-            'uniprot': phospho_rows[0]['uniprot'],
-            'gene_symbol': phospho_rows[0]['gene_symbol']
-        }
-        uniprot = protein_info['uniprot']
+        # Build lookup maps of packed kinase_data - key by position. Blobs are
+        # only size-checked here; PhosphoSite unpacks them on demand.
+        st_names = self.get_kinase_names(KINASE_TABLES['ST'])
+        y_names = self.get_kinase_names(KINASE_TABLES['Y'])
 
-        # Query 2: Get S/T kinase data
-        st_query = """
-            SELECT position, site, kinase_data
-            FROM st_kinase_specificity
-            WHERE uniprot = ?
-        """
-        cursor.execute(st_query, (uniprot,))
-        st_rows = cursor.fetchall()
-
-        # Query 3: Get Y kinase data
-        y_query = """
-            SELECT position, site, kinase_data
-            FROM y_kinase_specificity
-            WHERE uniprot = ?
-        """
-        cursor.execute(y_query, (uniprot,))
-        y_rows = cursor.fetchall()
+        st_kinase_map = build_kinase_map(st_rows, st_names, 'S/T')
+        y_kinase_map = build_kinase_map(y_rows, y_names, 'Y')
 
-        # Build lookup maps - key by position
-        st_kinase_map = {}
-        st_positions = set()  # Track which positions have S/T data
-        for row in st_rows:
-            try:
-                position = int(row['position'])
-                kinase_data = json.loads(row['kinase_data'])
-                # Ensure all values are floats
-                kinase_data = {k: float(v) for k, v in kinase_data.items()}
-                st_kinase_map[position] = kinase_data
-                st_positions.add(position)
-            except Exception as e:
-                print(f"Error parsing S/T kinase data at position {row['position']}: {e}")
-
-        y_kinase_map = {}
-        y_positions = set()  # Track which positions have Y data
-        for row in y_rows:
-            try:
-                position = int(row['position'])
-                kinase_data = json.loads(row['kinase_data'])
-                # Ensure all values are floats
-                kinase_data = {k: float(v) for k, v in kinase_data.items()}
-                y_kinase_map[position] = kinase_data
-                y_positions.add(position)
-            except Exception as e:
-                print(f"Error parsing Y kinase data at position {row['position']}: {e}")
-
-        print(f"DEBUG: Found S/T kinase data for positions: {sorted(list(st_positions)[:5])}...")
-        print(f"DEBUG: Found Y kinase data for positions: {sorted(list(y_positions)[:5])}...")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Found S/T kinase data for positions: %s...", list(st_kinase_map)[:5])
+            logger.debug("Found Y kinase data for positions: %s...", list(y_kinase_map)[:5])
 
         # Build sites list with proper kinase scores
         sites = []
-        for row in phospho_rows:
-            position = int(row['position'])
-            site_id = row['site']
+        for (_, position, site_id, _, residue, prob_raw, prob_calibrated,
+             known_positive, fdr_05, fdr_02, fdr_01) in phospho_rows:
 
-            # FIXED: Determine residue type based on which table has the data
-            kinase_scores = {}
+            # FIXED: Determine residue type based on which table has the data.
+            # The maps encode membership, so one get() per table is enough.
+            kinase_family = None
+            kinase_names = None
             residue_type = 'S'  # Default
 
-            if position in st_positions:
+            kinase_data = st_kinase_map.get(position)
+            if kinase_data is not None:
                 # This position has S/T kinase data
-                kinase_scores = st_kinase_map.get(position, {})
+                kinase_family = 'ST'
+                kinase_names = st_names
                 # Determine if it's S or T based on the site field in st_kinase_specificity
                 # For now, we'll call it S (could be S or T)
                 residue_type = 'S'  # Could also check the actual sequence if available
 
-            elif position in y_positions:
-                # This position has Y kinase data
-                kinase_scores = y_kinase_map.get(position, {})
-                residue_type = 'Y'
             else:
-                # No kinase data for this position (might be below threshold)
-                kinase_scores = {}
-                residue_type = 'S'  # Default guess
+                kinase_data = y_kinase_map.get(position)
+                if kinase_data is not None:
+                    # This position has Y kinase data
+                    kinase_family = 'Y'
+                    kinase_names = y_names
+                    residue_type = 'Y'
+                else:
+                    # No kinase data for this position (might be below threshold)
+                    residue_type = 'S'  # Default guess
 
             # Create site object
             site = PhosphoSite(
@@ -178,37 +467,57 @@ class KinoPlexQuery:
                 uniprot=protein_info['uniprot'],
                 gene_symbol=protein_info['gene_symbol'],
                 residue_type=residue_type,
-                predicted_prob_raw=float(row['predicted_prob_raw'] or 0),
-                predicted_prob_calibrated=float(row['predicted_prob_calibrated'] or 0),
-                known_positive=bool(row['known_positive']),
-                fdr_05=bool(row['predicted_calibrated_fdr_05']),
-                fdr_02=bool(row['predicted_calibrated_fdr_02']),
-                fdr_01=bool(row['predicted_calibrated_fdr_01']),
-                kinase_scores=kinase_scores
+                predicted_prob_raw=float(prob_raw or 0),
+                predicted_prob_calibrated=float(prob_calibrated or 0),
+                known_positive=bool(known_positive),
+                fdr_05=bool(fdr_05),
+                fdr_02=bool(fdr_02),
+                fdr_01=bool(fdr_01),
+                kinase_family=kinase_family,
+                kinase_data=kinase_data,
+                kinase_names=kinase_names,
+                residue=residue
             )
             sites.append(site)
 
-        # Calculate statistics
+        # Calculate statistics in a single pass over the sites
+        high_confidence = medium_confidence = known_positives = 0
+        sites_with_kinases = 0
+        max_position = 0
+        for s in sites:
+            if s.fdr_01:
+                high_confidence += 1
+            if s.fdr_02:
+                medium_confidence += 1
+            if s.known_positive:
+                known_positives += 1
+            if s.kinase_data:
+                sites_with_kinases += 1
+            if s.position > max_position:
+                max_position = s.position
+
         stats = {
             'total_sites': len(sites),
-            'high_confidence_sites': sum(1 for s in sites if s.fdr_01),
-            'medium_confidence_sites': sum(1 for s in sites if s.fdr_02),
-            'known_positive_sites': sum(1 for s in sites if s.known_positive),
-            'max_position': max((s.position for s in sites), default=0)
+            'high_confidence_sites': high_confidence,
+            'medium_confidence_sites': medium_confidence,
+            'known_positive_sites': known_positives,
+            'max_position': max_position
         }
 
         total_time = (time.time() - start_time) * 1000
 
         # Log performance and data quality
-        sites_with_kinases = sum(1 for s in sites if s.kinase_scores and len(s.kinase_scores) > 0)
-        print(f"Performance: {total_time:.1f}ms")
-        print(f"Sites with kinase data: {sites_with_kinases}/{len(sites)}")
-
-        # Debug: Show first few sites with kinase data
-        for site in sites[:5]:
-            if site.kinase_scores:
-                top_kinase = max(site.kinase_scores.items(), key=lambda x: x[1]) if site.kinase_scores else None
-                print(f"  Position {site.position}: {len(site.kinase_scores)} kinases, top: {top_kinase[0] if top_kinase else 'None'}")
+        logger.debug("Performance: %.1fms", total_time)
+        logger.debug("Sites with kinase data: %d/%d", sites_with_kinases, len(sites))
+
+        # Debug: Show first few sites with kinase data. Decoding the scores
+        # is the expensive part, so skip it entirely unless DEBUG is on.
+        if logger.isEnabledFor(logging.DEBUG):
+            for site in sites[:5]:
+                if site.kinase_scores:
+                    top_kinase = max(site.kinase_scores.items(), key=lambda x: x[1])
+                    logger.debug("  Position %s: %d kinases, top: %s",
+                                 site.position, len(site.kinase_scores), top_kinase[0])
 
         return {
             'protein': protein_info,
@@ -217,72 +526,107 @@ class KinoPlexQuery:
         }
 
     def get_kinase_profile_across_protein(self, identifier: str, kinase_name: str) -> List[Dict]:
-        """Get activity profile for a specific kinase across all sites"""
-        data = self.get_complete_protein_data(identifier)
-        if not data:
+        """
+        Get activity profile for a specific kinase across all sites
+
+        Only the requested kinase's score is read from each site - the
+        filtering happens in SQL and numpy rather than by decoding every
+        site's full kinase array.
+        """
+        slots = self.get_kinase_slots(kinase_name)
+        if not slots:
+            return []
+
+        protein_info = self.get_protein_info(identifier)
+        if not protein_info:
             return []
 
-        profile = []
-        for site in data['sites']:
-            if site.kinase_scores and kinase_name in site.kinase_scores:
-                score = site.kinase_scores[kinase_name]
-                if score > 0:
-                    profile.append({
-                        'position': site.position,
-                        'site': site.site,
-                        'residue': site.residue_type,
-                        'score': score,
-                        'phosphocompetent': site.fdr_05
-                    })
-
-        return sorted(profile, key=lambda x: x['score'], reverse=True)
+        # A kinase scored in both tables is profiled across both. A site in
+        # both tables keeps its S/T score, as it does when assembling sites.
+        itemsize = KINASE_SCORE_DTYPE.itemsize
+        by_position = {}
+        for family, idx in slots:
+            table_name = KINASE_TABLES[family]
+            expected = len(self.get_kinase_names(table_name)) * itemsize
+            rows = self._fetchall(
+                self._SQL_KINASE_PROFILE.format(table=table_name),
+                (idx * itemsize + 1, protein_info['uniprot'], expected)
+            )
+            residue = 'Y' if family == 'Y' else 'S'
+            for row in rows:
+                by_position.setdefault(row[0], (*row, residue))
+        if not by_position:
+            return []
+
+        rows = [by_position[position] for position in sorted(by_position)]
+        positions, site_ids, score_bytes, fdr_05, residues = zip(*rows)
+        scores = np.frombuffer(b''.join(score_bytes), dtype=KINASE_SCORE_DTYPE)
+
+        # Highest score first; ties keep position order
+        order = np.argsort(-scores, kind='stable')
+        order = order[scores[order] > 0]
+
+        return [
+            {
+                'position': positions[i],
+                'site': site_ids[i],
+                'residue': residues[i],
+                'score': score,
+                'phosphocompetent': bool(fdr_05[i])
+            }
+            for i, score in zip(order.tolist(), round_kinase_scores(scores[order]))
+        ]
 
     def search_proteins(self, query: str, limit: int = 50) -> List[Dict]:
-        """Search for proteins"""
-        cursor = self.conn.cursor()
-
-        search_query = """
-            SELECT DISTINCT uniprot, gene_symbol
-            FROM phospho_competency
-            WHERE uniprot LIKE ? OR gene_symbol LIKE ?
-            ORDER BY gene_symbol
-            LIMIT ?
         """
+        Search for proteins by UniProt ID or gene symbol substring.
 
-        pattern = f'%{query}%'
-        cursor.execute(search_query, (pattern, pattern, limit))
+        Uses the trigram protein_search FTS5 index. Trigrams can't match
+        queries shorter than 3 characters, so those fall back to LIKE - still
+        only over the one-row-per-protein search table, not every site.
+        """
+        if len(query) >= 3:
+            # Quote the query as a single FTS5 phrase so user input can't be
+            # parsed as query syntax
+            phrase = '"' + query.replace('"', '""') + '"'
+            rows = self._fetchall(self._SQL_SEARCH, (phrase, limit))
+        else:
+            pattern = f'%{query}%'
+            rows = self._fetchall(self._SQL_SEARCH_SHORT, (pattern, pattern, limit))
 
         results = []
-        for row in cursor.fetchall():
-            display = f"{row['gene_symbol']} ({row['uniprot']})" if row['gene_symbol'] else row['uniprot']
+        for uniprot, gene_symbol in rows:
+            display = f"{gene_symbol} ({uniprot})" if gene_symbol else uniprot
             results.append({
-                'uniprot': row['uniprot'],
-                'gene_symbol': row['gene_symbol'],
+                'uniprot': uniprot,
+                'gene_symbol': gene_symbol,
                 'display': display,
-                'value': row['uniprot']
+                'value': uniprot
             })
 
         return results
 
     def get_database_statistics(self) -> Dict:
-        """Get database statistics"""
-        cursor = self.conn.cursor()
-
-        stats = {}
-        cursor.execute("SELECT COUNT(DISTINCT uniprot) FROM phospho_competency")
-        stats['total_proteins'] = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(*) FROM phospho_competency")
-        stats['total_sites'] = cursor.fetchone()[0]
+        """
+        Get database statistics
 
-        cursor.execute("SELECT COUNT(*) FROM phospho_competency WHERE known_positive = 1")
-        stats['known_sites'] = cursor.fetchone()[0]
+        The counts need whole-table scans and the database is read-only
+        while serving, so they're computed once and reused.
+        """
+        if self._database_stats is None:
+            stats = {}
+            stats['total_proteins'] = self._fetchone(self._SQL_STATS_PROTEINS)[0]
+            stats['total_sites'] = self._fetchone(self._SQL_STATS_SITES)[0]
+            stats['known_sites'] = self._fetchone(self._SQL_STATS_KNOWN)[0]
+            self._database_stats = stats
 
-        return stats
+        return dict(self._database_stats)
 
 
 # Test the fix
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG, format='%(message)s')
+
     print("\n" + "="*60)
     print("TESTING FIXED KINASE DATA LOADING")
     print("="*60)
@@ -145,6 +145,7 @@
             }
 
             const data = await response.json();
+            decodeKinaseScores(data);
             proteinData = data;
             console.log(`Loaded ${data.sites.length} sites for protein ${PROTEIN_ID}`);
 
@@ -163,6 +164,34 @@
         }
     }
 
+    /**
+     * Expand the packed kinase scores sent by the API into per-site
+     * kinase -> score objects. Each site carries a base64 little-endian
+     * float32 array ordered like data.kinase_names[site.kinase_family].
+     */
+    function decodeKinaseScores(data) {
+        const kinaseNames = data.kinase_names || {};
+
+        data.sites.forEach(site => {
+            const names = kinaseNames[site.kinase_family];
+            const scores = {};
+
+            if (names && site.kinase_scores_b64) {
+                const bytes = Uint8Array.from(atob(site.kinase_scores_b64), c => c.charCodeAt(0));
+                const view = new DataView(bytes.buffer);
+                names.forEach((name, i) => {
+                    scores[name] = view.getFloat32(i * 4, true);
+                });
+            }
+
+            site.kinase_scores = scores;
+            delete site.kinase_scores_b64;
+            delete site.kinase_family;
+        });
+
+        delete data.kinase_names;
+    }
+
     /**
      * Load the protein sequence from UniProt via our backend
      */
@@ -0,0 +1,89 @@
+"""
+Kinase profile tests
+
+Builds a small database with a kinase scored in both the S/T and Y
+specificity tables and checks its profile covers both families.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from db_build import KinoPlexDatabaseBuilder
+from kinoplex_query import KinoPlexQuery
+
+
+class KinaseProfileTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+
+        positions = list(range(2, 120, 3))
+        phospho = pd.DataFrame({
+            'uniprot': 'P04637',
+            'geneSymbol': 'TP53',
+            'site': [f'P04637_{pos}' for pos in positions],
+            'position': positions,
+            'knownPositive': [pos % 2 == 0 for pos in positions],
+            'predictedProb_raw': rng.random(len(positions)),
+            'predictedProb_calibrated': rng.random(len(positions)),
+            'predicted_calibrated_fdr_05': [pos % 4 == 0 for pos in positions],
+            'predicted_calibrated_fdr_02': False,
+            'predicted_calibrated_fdr_01': False,
+        })
+
+        # Even positions are S/T sites and odd ones Y sites, except that
+        # position 8 is in both tables. CDK2 is scored in both tables.
+        paths = {}
+        for name, kinases, mask in (('st', ['CDK2', 'AKT1'], phospho.position % 2 == 0),
+                                    ('y', ['SRC', 'CDK2'], (phospho.position % 2 == 1) | (phospho.position == 8))):
+            table = phospho.loc[mask, ['uniprot', 'geneSymbol', 'site', 'position']].reset_index(drop=True)
+            for kinase in kinases:
+                table[kinase] = rng.random(len(table)) * 100
+            paths[name] = os.path.join(cls.tmp.name, f'{name}.feather')
+            table.to_feather(paths[name])
+
+        phospho_path = os.path.join(cls.tmp.name, 'phospho.feather')
+        phospho.to_feather(phospho_path)
+
+        cls.db_path = os.path.join(cls.tmp.name, 'kinoplex.db')
+        KinoPlexDatabaseBuilder(cls.db_path).build_database(phospho_path, paths['st'], paths['y'])
+        cls.db = KinoPlexQuery(cls.db_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.close()
+        cls.tmp.cleanup()
+
+    def test_kinase_in_both_tables(self):
+        profile = self.db.get_kinase_profile_across_protein('P04637', 'CDK2')
+
+        self.assertEqual({entry['residue'] for entry in profile}, {'S', 'Y'})
+
+        # Same sites, scores and order as reading each site's kinase scores
+        sites = self.db.get_complete_protein_data('P04637')['sites']
+        expected = sorted(
+            ((site.position, site.kinase_scores['CDK2']) for site in sites
+             if site.kinase_scores.get('CDK2', 0) > 0),
+            key=lambda item: item[1], reverse=True
+        )
+        self.assertEqual([(entry['position'], entry['score']) for entry in profile], expected)
+
+        # A site in both tables keeps its S/T score
+        site_8 = next(entry for entry in profile if entry['position'] == 8)
+        self.assertEqual(site_8['residue'], 'S')
+
+    def test_unknown_kinase(self):
+        self.assertEqual(self.db.get_kinase_profile_across_protein('P04637', 'NOPE'), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -10,11 +10,84 @@ The UniProt API is well-documented at: https://www.uniprot.org/help/api
 We use their REST API which returns data in JSON format for easy parsing.
 """
 
+import numpy as np
+import orjson
+import os
 import requests
-from typing import Optional, Dict
+import sqlite3
+import threading
+from cachetools import LRUCache
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, List, Tuple
 import time
 
 
+def _gene_name(data: Dict) -> str:
+    """Preferred gene name"""
+    genes = data.get('genes')
+    if genes:
+        return genes[0].get('geneName', {}).get('value', 'N/A')
+    return 'N/A'
+
+
+def _protein_name(data: Dict) -> str:
+    """Recommended protein name"""
+    recommended = data.get('proteinDescription', {}).get('recommendedName')
+    if recommended:
+        return recommended.get('fullName', {}).get('value', 'Unknown protein')
+    return 'Unknown protein'
+
+
+def _organism(data: Dict) -> str:
+    """Scientific name, with the common name in parentheses if available"""
+    organism = data.get('organism')
+    if not organism:
+        return 'Unknown'
+    name = organism.get('scientificName', 'Unknown')
+    common_name = organism.get('commonName')
+    return f"{name} ({common_name})" if common_name else name
+
+
+def _function(data: Dict) -> str:
+    """Text of the first FUNCTION comment"""
+    default = 'No functional annotation available.'
+    for comment in data.get('comments', ()):
+        if comment.get('commentType') == 'FUNCTION':
+            # Function text is in the 'texts' array
+            texts = comment.get('texts')
+            return texts[0].get('value', default) if texts else default
+    return default
+
+
+def _sequence_length(data: Dict) -> int:
+    """Sequence length as reported by UniProt"""
+    sequence = data.get('sequence', {})
+    return sequence.get('length', len(sequence.get('value', '')))
+
+
+# Field extractors for _parse_uniprot_data, built once at import. Each maps
+# one key of our flat record to the path it lives at in UniProt's JSON.
+_EXTRACTORS = (
+    ('accession', lambda data: data.get('primaryAccession', 'Unknown')),
+    ('gene_name', _gene_name),
+    ('protein_name', _protein_name),
+    ('organism', _organism),
+    ('function', _function),
+    # The amino acid sequence - crucial for our motif analysis feature
+    ('sequence', lambda data: data.get('sequence', {}).get('value', '')),
+    ('length', _sequence_length),
+)
+
+
+# Default location of the persistent record cache: next to this module, so
+# it doesn't depend on the working directory. KINOPLEX_UNIPROT_CACHE
+# overrides it; set it empty to keep records in memory only.
+DEFAULT_CACHE_PATH = os.environ.get('KINOPLEX_UNIPROT_CACHE',
+                                    str(Path(__file__).resolve().parent / 'uniprot_cache.db'))
+
+
 class UniProtClient:
     """
     Client for interacting with the UniProt REST API.
@@ -25,33 +98,316 @@ class UniProtClient:
     still want to minimize requests both for performance and courtesy.
     """
 
-    def __init__(self):
-        """Initialize the UniProt client with base URL and cache."""
+    # Maximum number of parsed UniProt records kept in memory
+    CACHE_MAXSIZE = 4096
+
+    # Records on disk younger than this are used without asking UniProt;
+    # older ones are revalidated with If-None-Match
+    CACHE_TTL = 7 * 24 * 3600
+
+    # Accessions per request to the batch endpoint
+    BATCH_SIZE = 100
+
+    # Most concurrent requests (and pooled connections) to UniProt
+    MAX_CONNECTIONS = 16
+
+    def __init__(self, cache_path: Optional[str] = DEFAULT_CACHE_PATH):
+        """
+        Initialize the UniProt client with base URL and caches.
+
+        Args:
+            cache_path: SQLite file for the persistent record cache, shared
+                by every worker process and kept across restarts. Created
+                on first use. None keeps records in memory only.
+        """
         self.base_url = "https://rest.uniprot.org/uniprotkb"
-        # Simple in-memory cache for this session
-        # In production, you might use Redis or file-based caching
-        self._cache = {}
+        # One session so every request reuses the same TCP + TLS connections,
+        # with enough of them pooled for get_protein_info_many
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(pool_connections=1,
+                                                   pool_maxsize=self.MAX_CONNECTIONS))
+        # In-memory cache for this process, keyed by accession
+        self._cache = LRUCache(maxsize=self.CACHE_MAXSIZE)
+        # Bare sequences as ASCII bytes, for motif and residue lookups
+        self._seq_cache = LRUCache(maxsize=self.CACHE_MAXSIZE)
+        # get_protein_info_many fills both caches from several threads, and
+        # even an LRUCache lookup reorders entries
+        self._cache_lock = threading.Lock()
+
+        # The disk cache is opened on first use (see _open_disk), so merely
+        # importing this module never creates a file
+        self._cache_path = cache_path or None
+        self._disk = None
+        self._disk_lock = threading.Lock()
 
     def get_protein_info(self, uniprot_id: str) -> Optional[Dict]:
+        # Records are idempotent and large, so every page view, sequence and
+        # motif request after the first is served from memory, and the disk
+        # cache survives restarts. Failed fetches are deliberately not cached
+        # so a UniProt hiccup isn't permanent.
+        cached, stored = self._lookup(uniprot_id)
+        if cached is not None:
+            return cached
+
+        etag = None
+        if stored is not None:
+            etag, _, protein_info = stored
+
         try:
             url = f"{self.base_url}/{uniprot_id}.json"
-            response = requests.get(url, timeout=10)
-
-            if response.status_code == 404:
+            # Revalidate a stale record - an unchanged entry comes back as an
+            # empty 304 instead of the full JSON
+            headers = {'If-None-Match': etag} if etag else None
+            response = self.session.get(url, headers=headers, timeout=10)
+
+            if response.status_code == 304 and stored is not None:
+                self._disk_put(uniprot_id, etag, protein_info)
+                self._remember(uniprot_id, protein_info)
+                return protein_info
+            elif response.status_code == 404:
                 return None
             elif response.status_code != 200:
                 print(f"UniProt API error: {response.status_code}")  # This might be failing silently
                 return None
 
-            data = response.json()
+            # Full UniProt entries run to hundreds of KB of JSON - orjson
+            # parses the raw bytes several times faster than response.json()
+            data = orjson.loads(response.content)
             protein_info = self._parse_uniprot_data(data)
 
+            self._disk_put(uniprot_id, response.headers.get('ETag'), protein_info)
+            self._remember(uniprot_id, protein_info)
+
             return protein_info
 
         except requests.RequestException as e:
             print(f"Error fetching UniProt data: {e}")  # Check if this is being printed
+            # A stale record beats no record while UniProt is unreachable
+            return stored[2] if stored is not None else None
+        except orjson.JSONDecodeError as e:
+            print(f"Error parsing UniProt data: {e}")
+            return None
+
+    def get_protein_info_many(self, uniprot_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Get protein information for several accessions concurrently.
+
+        Each accession goes through get_protein_info - so caching, ETag
+        revalidation and 404 handling are unchanged - but the uncached ones
+        are fetched in parallel over the session's connection pool instead
+        of one after another. Prefer get_protein_info_batch for long lists.
+
+        Args:
+            uniprot_ids: UniProt accessions
+
+        Returns:
+            Dictionary mapping accession to parsed record. Accessions that
+            couldn't be retrieved are left out.
+        """
+        uniprot_ids = list(dict.fromkeys(uniprot_ids))
+        if not uniprot_ids:
+            return {}
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=min(len(uniprot_ids), self.MAX_CONNECTIONS)) as pool:
+            for uniprot_id, protein_info in zip(uniprot_ids, pool.map(self.get_protein_info, uniprot_ids)):
+                if protein_info is not None:
+                    results[uniprot_id] = protein_info
+        return results
+
+    def get_protein_info_batch(self, uniprot_ids: List[str]) -> Dict[str, Dict]:
+        """
+        Get protein information for many accessions at once.
+
+        Cached records are served locally; the rest are fetched from UniProt's
+        accessions endpoint, one request per BATCH_SIZE accessions rather than
+        one round-trip each.
+
+        Args:
+            uniprot_ids: UniProt accessions
+
+        Returns:
+            Dictionary mapping each requested accession to its parsed record.
+            Accessions UniProt doesn't know, or that couldn't be fetched, are
+            left out.
+        """
+        results = {}
+        missing = []
+        for uniprot_id in dict.fromkeys(uniprot_ids):
+            cached, _ = self._lookup(uniprot_id)
+            if cached is not None:
+                results[uniprot_id] = cached
+            else:
+                missing.append(uniprot_id)
+
+        for start in range(0, len(missing), self.BATCH_SIZE):
+            batch = missing[start:start + self.BATCH_SIZE]
+            # Records come back under their primary accession; map them to
+            # the IDs asked for, which may be secondary accessions
+            wanted = set(batch)
+            url = f"{self.base_url}/accessions"
+            # The endpoint pages its results (25 by default) - ask for the
+            # whole batch in one page, and follow Link: rel="next" regardless
+            params = {'accessions': ','.join(batch), 'format': 'json', 'size': len(batch)}
+            try:
+                while url:
+                    response = self.session.get(url, params=params, timeout=30)
+
+                    if response.status_code != 200:
+                        print(f"UniProt API error: {response.status_code}")
+                        break
+
+                    for data in orjson.loads(response.content).get('results', []):
+                        protein_info = self._parse_uniprot_data(data)
+                        accessions = {protein_info['accession'], *data.get('secondaryAccessions', ())}
+                        for uniprot_id in accessions & wanted:
+                            # No per-record ETag here - the record is simply
+                            # refetched once it goes stale
+                            self._disk_put(uniprot_id, None, protein_info)
+                            self._remember(uniprot_id, protein_info)
+                            results[uniprot_id] = protein_info
+
+                    # The next-page URL already carries the query
+                    url = response.links.get('next', {}).get('url')
+                    params = None
+
+            except requests.RequestException as e:
+                print(f"Error fetching UniProt data: {e}")
+            except orjson.JSONDecodeError as e:
+                print(f"Error parsing UniProt data: {e}")
+
+        return results
+
+    def get_sequence(self, uniprot_id: str) -> Optional[bytes]:
+        """
+        Get just the amino acid sequence of a protein, as ASCII bytes.
+
+        Taken from the full record when one is already cached; otherwise only
+        the FASTA is fetched, a fraction of the size of the JSON entry.
+
+        Args:
+            uniprot_id: UniProt accession
+
+        Returns:
+            Sequence bytes, or None if it couldn't be retrieved
+        """
+        with self._cache_lock:
+            sequence = self._seq_cache.get(uniprot_id)
+        if sequence is not None:
+            return sequence
+
+        cached, _ = self._lookup(uniprot_id)
+        if cached is not None:
+            sequence = cached.get('sequence', '').encode('ascii')
+        else:
+            try:
+                response = self.session.get(f"{self.base_url}/{uniprot_id}.fasta", timeout=10)
+
+                if response.status_code == 404:
+                    return None
+                elif response.status_code != 200:
+                    print(f"UniProt API error: {response.status_code}")
+                    return None
+
+                # Drop the header line and join the wrapped sequence lines
+                sequence = b''.join(line.strip() for line in response.content.splitlines()
+                                    if not line.startswith(b'>'))
+
+            except requests.RequestException as e:
+                print(f"Error fetching UniProt sequence: {e}")
+                return None
+
+        if not sequence:
             return None
 
+        with self._cache_lock:
+            self._seq_cache[uniprot_id] = sequence
+
+        return sequence
+
+    def _lookup(self, uniprot_id: str) -> Tuple[Optional[Dict], Optional[Tuple]]:
+        """
+        Look up a record in memory, then on disk.
+
+        Returns:
+            (record, stored) - record is a usable cached record or None, and
+            stored is the disk entry (possibly stale) for revalidation
+        """
+        with self._cache_lock:
+            cached = self._cache.get(uniprot_id)
+        if cached is not None:
+            return cached, None
+
+        stored = self._disk_get(uniprot_id)
+        if stored is not None:
+            _, fetched_at, protein_info = stored
+            if time.time() - fetched_at < self.CACHE_TTL:
+                self._remember(uniprot_id, protein_info)
+                return protein_info, stored
+
+        return None, stored
+
+    def _remember(self, uniprot_id: str, protein_info: Dict):
+        """Add a record to the in-memory cache"""
+        with self._cache_lock:
+            self._cache[uniprot_id] = protein_info
+
+    def _open_disk(self) -> Optional[sqlite3.Connection]:
+        """Open the disk cache on first use. Call with _disk_lock held."""
+        if self._disk is None and self._cache_path:
+            try:
+                disk = sqlite3.connect(self._cache_path, check_same_thread=False,
+                                       isolation_level=None, timeout=10)
+                disk.execute("PRAGMA journal_mode = WAL")
+                disk.execute("""
+                    CREATE TABLE IF NOT EXISTS uniprot_records (
+                        accession TEXT PRIMARY KEY,
+                        etag TEXT,
+                        fetched_at REAL NOT NULL,
+                        record BLOB NOT NULL
+                    ) WITHOUT ROWID
+                """)
+                self._disk = disk
+            except sqlite3.Error as e:
+                print(f"UniProt disk cache unavailable: {e}")
+                # Don't retry on every lookup
+                self._cache_path = None
+        return self._disk
+
+    def _disk_get(self, uniprot_id: str) -> Optional[Tuple[Optional[str], float, Dict]]:
+        """Look up (etag, fetched_at, record) in the disk cache"""
+        try:
+            with self._disk_lock:
+                disk = self._open_disk()
+                if disk is None:
+                    return None
+                row = disk.execute(
+                    "SELECT etag, fetched_at, record FROM uniprot_records WHERE accession = ?",
+                    (uniprot_id,)
+                ).fetchone()
+            if row is None:
+                return None
+            etag, fetched_at, record = row
+            return etag, fetched_at, orjson.loads(record)
+        except (sqlite3.Error, orjson.JSONDecodeError) as e:
+            print(f"Error reading UniProt disk cache: {e}")
+            return None
+
+    def _disk_put(self, uniprot_id: str, etag: Optional[str], protein_info: Dict):
+        """Store a record in the disk cache"""
+        try:
+            with self._disk_lock:
+                disk = self._open_disk()
+                if disk is None:
+                    return
+                disk.execute(
+                    "INSERT OR REPLACE INTO uniprot_records (accession, etag, fetched_at, record) "
+                    "VALUES (?, ?, ?, ?)",
+                    (uniprot_id, etag, time.time(), orjson.dumps(protein_info))
+                )
+        except sqlite3.Error as e:
+            print(f"Error writing UniProt disk cache: {e}")
+
     def _parse_uniprot_data(self, data: Dict) -> Dict:
         """
         Parse the complex UniProt JSON response into a simpler structure.
@@ -66,59 +422,7 @@ class UniProtClient:
         Returns:
             Simplified dictionary with key protein information
         """
-        # Extract accession (UniProt ID)
-        accession = data.get('primaryAccession', 'Unknown')
-
-        # Extract gene name (preferred name)
-        gene_name = 'N/A'
-        if 'genes' in data and len(data['genes']) > 0:
-            gene_data = data['genes'][0]
-            if 'geneName' in gene_data:
-                gene_name = gene_data['geneName'].get('value', 'N/A')
-
-        # Extract protein name (recommended name)
-        protein_name = 'Unknown protein'
-        if 'proteinDescription' in data:
-            desc = data['proteinDescription']
-            if 'recommendedName' in desc:
-                protein_name = desc['recommendedName'].get('fullName', {}).get('value', protein_name)
-
-        # Extract organism
-        organism = 'Unknown'
-        if 'organism' in data:
-            organism = data['organism'].get('scientificName', 'Unknown')
-            # Add common name in parentheses if available
-            common_name = data['organism'].get('commonName')
-            if common_name:
-                organism = f"{organism} ({common_name})"
-
-        # Extract function (comments with type "FUNCTION")
-        function = 'No functional annotation available.'
-        if 'comments' in data:
-            for comment in data['comments']:
-                if comment.get('commentType') == 'FUNCTION':
-                    # Function text is in the 'texts' array
-                    if 'texts' in comment and len(comment['texts']) > 0:
-                        function = comment['texts'][0].get('value', function)
-                    break
-
-        # Extract the amino acid sequence
-        # This is crucial for our motif analysis feature
-        sequence = ''
-        seq_length = 0
-        if 'sequence' in data:
-            sequence = data['sequence'].get('value', '')
-            seq_length = data['sequence'].get('length', len(sequence))
-
-        return {
-            'accession': accession,
-            'gene_name': gene_name,
-            'protein_name': protein_name,
-            'organism': organism,
-            'function': function,
-            'sequence': sequence,
-            'length': seq_length
-        }
+        return {key: extract(data) for key, extract in _EXTRACTORS}
 
     def get_sequence_motif(self, uniprot_id: str, position: int,
                            window: int = 7) -> Optional[str]:
@@ -148,15 +452,13 @@ class UniProtClient:
                       ^^^^^^^S^^^^^^^
                       (S at position 15 in the center)
         """
-        # Get the full sequence (from cache if available)
-        protein_info = self.get_protein_info(uniprot_id)
+        # Get the bare sequence (from cache if available)
+        sequence = self.get_sequence(uniprot_id)
 
-        if not protein_info or not protein_info.get('sequence'):
+        if not sequence:
             return None
 
-        sequence = protein_info['sequence']
-
-        # Convert to 0-indexed for Python string slicing
+        # Convert to 0-indexed for slicing
         # UniProt positions are 1-indexed (first amino acid is position 1)
         zero_based_pos = position - 1
 
@@ -168,7 +470,46 @@ class UniProtClient:
         # Extract the motif
         motif = sequence[start:end]
 
-        return motif
+        return motif.decode('ascii')
+
+    def get_sequence_motifs(self, uniprot_id: str, positions,
+                            window: int = 7) -> Optional[List[str]]:
+        """
+        Extract the sequence motifs around many sites of one protein at once.
+
+        Same result as calling get_sequence_motif for each valid position,
+        but all motifs are gathered from the sequence in one vectorized
+        indexing step rather than one Python call and slice per site.
+
+        Args:
+            uniprot_id: UniProt accession
+            positions: Positions of the phosphorylation sites (1-indexed)
+            window: Number of residues to include on each side (default 7)
+
+        Returns:
+            List of motifs in the order of positions, or None if the
+            sequence couldn't be retrieved
+        """
+        sequence = self.get_sequence(uniprot_id)
+
+        if not sequence:
+            return None
+
+        seq = np.frombuffer(sequence, dtype=np.uint8)
+        positions = np.asarray(positions, dtype=np.int64)
+        width = 2 * window + 1
+
+        # (sites, width) indices of every motif residue; those beyond either
+        # terminus become NUL bytes
+        idx = positions[:, None] - 1 + np.arange(-window, window + 1)
+        in_range = (idx >= 0) & (idx < seq.size)
+        motifs = np.where(in_range, seq[np.clip(idx, 0, seq.size - 1)], 0).astype(np.uint8)
+
+        # Viewed as fixed-width byte strings numpy drops the trailing NULs;
+        # stripping the leading ones truncates motifs at the N-terminus just
+        # like get_sequence_motif
+        return [motif.lstrip(b'\0').decode('ascii')
+                for motif in motifs.view(f'S{width}').ravel().tolist()]
 
     def get_residue_at_position(self, uniprot_id: str, position: int) -> Optional[str]:
         """
@@ -186,13 +527,11 @@ class UniProtClient:
         Returns:
             Single letter amino acid code, or None if position invalid
         """
-        protein_info = self.get_protein_info(uniprot_id)
+        sequence = self.get_sequence(uniprot_id)
 
-        if not protein_info or not protein_info.get('sequence'):
+        if not sequence:
             return None
 
-        sequence = protein_info['sequence']
-
         # Convert to 0-indexed
         zero_based_pos = position - 1
 
@@ -200,7 +539,7 @@ class UniProtClient:
         if zero_based_pos < 0 or zero_based_pos >= len(sequence):
             return None
 
-        return sequence[zero_based_pos]
+        return chr(sequence[zero_based_pos])
 
 
 # Create a singleton instance for use throughout the application
@@ -216,6 +555,30 @@ def get_protein_data(uniprot_id: str) -> Optional[Dict]:
     return uniprot_client.get_protein_info(uniprot_id)
 
 
+def get_sequence_motifs(uniprot_id: str, positions, window: int = 7) -> Optional[List[str]]:
+    """
+    Convenience function to get the sequence motifs around many sites.
+    Use this rather than looping get_sequence_motif over a protein's sites.
+    """
+    return uniprot_client.get_sequence_motifs(uniprot_id, positions, window)
+
+
+def get_protein_data_batch(uniprot_ids: List[str]) -> Dict[str, Dict]:
+    """
+    Convenience function to get protein information for many accessions.
+    Prefer this over looping get_protein_data when resolving a list of proteins.
+    """
+    return uniprot_client.get_protein_info_batch(uniprot_ids)
+
+
+def get_protein_data_many(uniprot_ids: List[str]) -> Dict[str, Dict]:
+    """
+    Convenience function to fetch a handful of proteins concurrently.
+    Unlike the batch call, each record keeps ETag revalidation.
+    """
+    return uniprot_client.get_protein_info_many(uniprot_ids)
+
+
 def get_sequence_motif(uniprot_id: str, position: int, window: int = 7) -> Optional[str]:
     """
     Convenience function to get sequence motif around a site.